@@ -0,0 +1,118 @@
+# Incremental budget gap must be identical to a full recomputation
+
+# Import packages
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from fepbe import budget_gap
+from fepbe.budget_gap import (
+    calculate_budget_gaps,
+    calculate_marginal_prices,
+    filter_budget_gap_slices,
+    make_import_volumes,
+    update_budget_gaps,
+)
+
+
+def make_supply(blocks):
+    return pd.DataFrame([
+        {"region": region, "export": "LH2", "year": 2050, "import_demand": volume, "price": price}
+        for region, volume, price in blocks
+    ])
+
+
+def make_demand(points):
+    return pd.DataFrame([
+        {"region": "EU", "year": 2050, "scenario": "config.GreenDeal", "price": price, "import_demand": volume}
+        for volume, price in points
+    ])
+
+
+def budget_gaps(state_path, supply, demand):
+    kwargs = dict(demand_curve=demand, region="EU", scenario="config.GreenDeal", year=2050, step=1.0)
+    full = calculate_budget_gaps(supply_curves={"LH2": supply}, **kwargs)
+    incremental = update_budget_gaps(state_path=state_path, supply_curves={"LH2": supply}, final_carrier="H2", wacc="0.09", **kwargs)
+
+    # Stored marginal prices must match a fresh calculation as well
+    supply_slice, demand_slice = filter_budget_gap_slices(supply, demand, "EU", "config.GreenDeal", 2050)
+    prices = calculate_marginal_prices(supply_slice, demand_slice, make_import_volumes(supply_slice, demand_slice))
+    stored = pd.read_csv(state_path / "EU_budget_gap_config.GreenDeal_LH2_H2_0.09_2050_1.0_prices.csv", index_col=0, float_precision="round_trip")
+    pdt.assert_frame_equal(prices, stored, check_exact=True, check_dtype=False)
+
+    return full, incremental
+
+
+supply = [("Egypt", 10, 120.0), ("Kenya", 15, 140.0), ("Morocco", 20, 110.0), ("Namibia", 25, 160.0)]
+demand = [(0, 200.0), (12, 150.0), (30, 120.0), (55, 90.0), (70, 50.0)]
+
+changes = {
+    "supply price": (supply[:1] + [("Kenya", 15, 105.0)] + supply[2:], demand),
+    "supply appended": (supply + [("Tunisia", 10, 130.0)], demand),
+    "supply removed": (supply[:-1], demand),
+    "demand price": (supply, demand[:2] + [(30, 125.0)] + demand[3:]),
+    "demand appended": (supply, demand + [(80, 30.0)]),
+    "demand removed": (supply, demand[:-1]),
+    "first demand point": (supply, [(0, 190.0)] + demand[1:]),
+}
+
+
+@pytest.mark.parametrize("change", changes)
+def test_update_budget_gap_identical(tmp_path, change):
+    budget_gaps(tmp_path, make_supply(supply), make_demand(demand))
+
+    full, incremental = budget_gaps(tmp_path, make_supply(changes[change][0]), make_demand(changes[change][1]))
+    pdt.assert_frame_equal(full, incremental, check_exact=True)
+
+
+def test_update_budget_gap_last_demand_point_becomes_interior(tmp_path):
+    # Price at 20 TWh switches from the clamped last point to the interpolated value
+    supply = make_supply([("Egypt", 20, 0.9), ("Kenya", 20, 1.0)])
+    budget_gaps(tmp_path, supply, make_demand([(0, 0.2), (20, 0.9)]))
+
+    full, incremental = budget_gaps(tmp_path, supply, make_demand([(0, 0.2), (20, 0.9), (40, 1.0)]))
+    pdt.assert_frame_equal(full, incremental, check_exact=True)
+
+    # Dropping the point again
+    full, incremental = budget_gaps(tmp_path, supply, make_demand([(0, 0.2), (20, 0.9)]))
+    pdt.assert_frame_equal(full, incremental, check_exact=True)
+
+
+def recomputed_volumes(monkeypatch, tmp_path, supply_new, demand_new):
+    """
+    Returns the volumes at which the update recomputes the marginal prices.
+    """
+    budget_gaps(tmp_path, make_supply(supply), make_demand(demand))
+
+    calls = []
+
+    def spy(supply_slice, demand_slice, volumes):
+        calls.extend(volumes)
+        return calculate_marginal_prices(supply_slice, demand_slice, volumes)
+
+    kwargs = dict(demand_curve=make_demand(demand_new), region="EU", scenario="config.GreenDeal", year=2050, step=1.0)
+    monkeypatch.setattr(budget_gap, "calculate_marginal_prices", spy)
+    incremental = update_budget_gaps(state_path=tmp_path, supply_curves={"LH2": make_supply(supply_new)}, final_carrier="H2", wacc="0.09", **kwargs)
+    monkeypatch.undo()
+
+    full = calculate_budget_gaps(supply_curves={"LH2": make_supply(supply_new)}, **kwargs)
+    pdt.assert_frame_equal(full, incremental, check_exact=True)
+
+    return calls
+
+
+def test_update_budget_gap_recomputes_changed_supply_block(monkeypatch, tmp_path):
+    # Namibia is the last block in merit order, starting at 45 TWh
+    volumes = recomputed_volumes(monkeypatch, tmp_path, supply[:-1] + [("Namibia", 25, 170.0)], demand)
+    assert volumes == [float(v) for v in range(45, 71)]
+
+
+def test_update_budget_gap_recomputes_changed_demand_point(monkeypatch, tmp_path):
+    # Demand point at 55 TWh changed, prices change from the preceding point at 30 TWh
+    volumes = recomputed_volumes(monkeypatch, tmp_path, supply, demand[:3] + [(55, 95.0)] + demand[4:])
+    assert volumes == [float(v) for v in range(30, 71)]
+
+
+def test_update_budget_gap_unchanged(monkeypatch, tmp_path):
+    assert recomputed_volumes(monkeypatch, tmp_path, supply, demand) == []
+    assert recomputed_volumes(monkeypatch, tmp_path, supply[::-1], demand[::-1]) == []
@@ -0,0 +1,31 @@
+# Command-line interface
+
+# Import packages
+import sys
+
+import pandas as pd
+
+from fepbe.cli import main
+
+
+def test_budget_gap_without_heavy_imports(tmp_path):
+    supply_curve = pd.DataFrame({
+        "region": ["Egypt", "Kenya"], "export": "LH2", "year": 2050, "import_demand": [10.0, 10.0], "price": [120.0, 150.0],
+    })
+    demand_curve = pd.DataFrame({
+        "region": "EU", "year": 2050, "scenario": "config.GreenDeal", "price": [0, 100, 200], "import_demand": [20.0, 10.0, 0.0],
+    })
+    supply_curve.to_csv(tmp_path / "supply_curve_LH2_H2_0.09_1H_inc_x.csv")
+    demand_curve.to_csv(tmp_path / "demand_curve-x-H2.csv")
+
+    main([
+        "budget-gap", "--curves-path", str(tmp_path), "--output-path", str(tmp_path),
+        "--resolution", "1H", "--prefix", "x", "--years", "2050",
+    ])
+
+    budget_gap = pd.read_csv(tmp_path / "EU_budget_gap_config.GreenDeal_LH2_H2_0.09_2050.csv")
+    assert list(budget_gap.columns) == ["import_volume", "budget_gap_LH2"]
+    assert len(budget_gap) == 20
+
+    assert "pypsa" not in sys.modules
+    assert "matplotlib" not in sys.modules
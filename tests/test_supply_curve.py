@@ -0,0 +1,126 @@
+# Cost breakdown and update of the supply curve
+
+# Import packages
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from fepbe.supply_curve import export_cost_breakdown, get_technology_group, update_supply_curve
+
+
+@pytest.mark.parametrize("carrier, group", [
+    ("onwind", "renewables"),
+    ("offwind-ac", "renewables"),
+    ("solar rooftop", "renewables"),
+    ("hydro", "renewables"),
+    ("H2 Electrolysis", "electrolysis"),
+    ("Haber-Bosch", "synthesis"),
+    ("H2 liquefaction", "conversion"),
+    ("battery charger", "storage"),
+    ("H2 Store", "storage"),
+    ("fuel ship export", "shipping"),
+    ("hydrogen", None),
+    ("H2 Fuel Cell", None),
+    ("shipping oil", None),
+    ("H2 for shipping", None),
+    ("residential rural solar thermal", None),
+    ("urban central solar thermal", None),
+])
+def test_get_technology_group(carrier, group):
+    assert get_technology_group(carrier) == group
+
+
+def series(values):
+    index = pd.MultiIndex.from_tuples([("Link", c) for c in values], names=["component", "carrier"])
+    return pd.Series(list(values.values()), index=index, dtype=float)
+
+
+class Statistics:
+    def __init__(self, capex, opex, withdrawal):
+        self._capex, self._opex, self._withdrawal = capex, opex, withdrawal
+
+    def capex(self):
+        return series(self._capex)
+
+    def opex(self, aggregate_time="sum"):
+        return series(self._opex)
+
+    def withdrawal(self, bus_carrier, aggregate_time="sum"):
+        return series(self._withdrawal.get(bus_carrier, {}))
+
+
+class Network:
+    def __init__(self, **kwargs):
+        self.statistics = Statistics(**kwargs)
+
+
+costs = {
+    "onwind": 100.0, "solar thermal": 50.0, "H2 Electrolysis": 40.0, "H2 liquefaction": 20.0,
+    "fuel ship export": 10.0, "battery": 8.0, "H2 Store": 4.0, "H2 Fuel Cell": 30.0,
+}
+
+
+def test_export_cost_breakdown():
+    n = Network(
+        capex=costs,
+        opex={c: v / 10 for c, v in costs.items()},
+        withdrawal={
+            # 3/4 of the hydrogen is exported
+            "H2": {"H2 liquefaction": 60.0, "H2 for industry": 20.0, "H2 Store": 100.0},
+            # electricity: electrolysis 3/4 exported, liquefaction fully, domestic load not
+            "AC": {"H2 Electrolysis": 80.0, "H2 liquefaction": 20.0, "electricity": 100.0, "battery charger": 50.0},
+        },
+    )
+    breakdown = export_cost_breakdown(n)
+
+    hydrogen_share = 0.75
+    electricity_share = (80.0 * 0.75 + 20.0) / 200.0
+    assert breakdown["capex_shipping"] == pytest.approx(10.0)
+    assert breakdown["capex_conversion"] == pytest.approx(20.0)
+    assert breakdown["capex_electrolysis"] == pytest.approx(40.0 * hydrogen_share)
+    assert breakdown["capex_renewables"] == pytest.approx(100.0 * electricity_share)
+    assert breakdown["capex_storage"] == pytest.approx(8.0 * electricity_share + 4.0 * hydrogen_share)
+    assert breakdown["opex_renewables"] == pytest.approx(10.0 * electricity_share)
+    assert breakdown["capex_synthesis"] == 0
+
+
+def test_export_cost_breakdown_without_withdrawal():
+    n = Network(capex=costs, opex=costs, withdrawal={})
+    breakdown = export_cost_breakdown(n)
+
+    assert breakdown["capex_shipping"] == pytest.approx(10.0)
+    assert breakdown["capex_electrolysis"] == 0
+    assert breakdown["capex_renewables"] == 0
+    assert breakdown["capex_storage"] == 0
+
+
+def make_supply_curve(rows):
+    return pd.DataFrame(rows, columns=["region", "export", "year", "import_demand", "price"])
+
+
+stored = make_supply_curve([
+    ("Egypt", "LH2", 2030, 5, 150.0),
+    ("Egypt", "LH2", 2030, 10, 160.0),
+    ("Kenya", "LH2", 2030, 5, 170.0),
+    ("Kenya", "LH2", 2030, 10, 180.0),
+])
+
+
+def test_update_supply_curve():
+    # Kenya re-solved, 10 TWh network missing, 15 TWh network added
+    supply_curve = make_supply_curve([
+        ("Kenya", "LH2", 2030, 5, 175.0),
+        ("Kenya", "LH2", 2030, 15, 190.0),
+    ])
+    expected = make_supply_curve([
+        ("Egypt", "LH2", 2030, 5, 150.0),
+        ("Egypt", "LH2", 2030, 10, 160.0),
+        ("Kenya", "LH2", 2030, 5, 175.0),
+        ("Kenya", "LH2", 2030, 10, 180.0),
+        ("Kenya", "LH2", 2030, 15, 190.0),
+    ])
+    pdt.assert_frame_equal(update_supply_curve(stored, supply_curve), expected)
+
+
+def test_update_supply_curve_without_networks():
+    pdt.assert_frame_equal(update_supply_curve(stored, pd.DataFrame()), stored)
@@ -0,0 +1,4 @@
+# Evaluation of supply curves, demand curves and budget gaps
+#
+# Heavy packages (pypsa, matplotlib) are only imported inside the functions
+# that need them, so importing this package stays cheap.
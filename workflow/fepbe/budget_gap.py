@@ -0,0 +1,341 @@
+# Analyse budget gap of supply demand curve
+
+# Import packages
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def interpolate_price_from_demand_curve(demand_slice, volume):
+    """
+    Returns the interpolated demand price at a given import volume (PyPSA-Eur).
+    """
+
+    df = demand_slice.sort_values("import_demand").reset_index(drop=True)
+    q = df["import_demand"].to_numpy()
+    p = df["price"].to_numpy()
+
+    # Below minimum → use first price
+    if volume <= q[0]:
+        return float(p[0])
+    # Above maximum → use last price
+    if volume >= q[-1]:
+        return float(p[-1])
+
+    # Find bounding index for interpolation
+    idx = np.searchsorted(q, volume)
+    q1, q2 = q[idx - 1], q[idx]
+    p1, p2 = p[idx - 1], p[idx]
+
+    # Find bounding index for interpolation
+    return float(p1 + (p2 - p1) * (volume - q1) / (q2 - q1))
+
+
+def make_marginal_supply_curve(supply_slice):
+    """
+    Converts supply curve into marginal supply intervals.
+    """
+
+    sup = supply_slice.sort_values("price").copy()
+    sup["x_right"] = sup["import_demand"].cumsum()
+    sup["x_left"] = sup["x_right"].shift(fill_value=0)
+    return sup[["x_left", "x_right", "price"]]
+
+
+def get_marginal_supply_price(marginal_supply, volume):
+    """
+    Returns the supply price of the marginal exporter at a given volume.
+    """
+
+    row = marginal_supply[marginal_supply["x_right"] >= volume].iloc[0]
+    return float(row["price"])
+
+
+def filter_budget_gap_slices(supply_curve, demand_curve, region, scenario, year):
+    """
+    Returns the supply and demand slices relevant for the budget gap.
+    """
+
+    # Filter demand
+    demand_slice = demand_curve[
+        (demand_curve["year"] == year) &
+        (demand_curve["region"] == region) &
+        (demand_curve["scenario"] == scenario)
+    ]
+    if demand_slice.empty:
+        raise ValueError("No matching demand data found.")
+
+    # Filter supply
+    supply_slice = supply_curve[supply_curve["year"] == year]
+    if supply_slice.empty:
+        raise ValueError("No matching supply data found.")
+
+    return supply_slice, demand_slice
+
+
+def make_import_volumes(supply_slice, demand_slice, step=1.0):
+    """
+    Returns the import volumes at which the budget gap is evaluated.
+    """
+
+    # Determine maximum feasible import volume
+    max_supply = supply_slice["import_demand"].sum()
+    max_demand = demand_slice["import_demand"].max()
+    max_volume = min(max_supply, max_demand)
+
+    volumes = []
+
+    v = step
+    while v <= max_volume + 1e-9:
+        volumes.append(v)
+        v += step
+
+    return volumes
+
+
+def calculate_marginal_prices(supply_slice, demand_slice, volumes):
+    """
+    Returns the marginal supply and demand price at each import volume.
+    """
+
+    # Analyse marginal supply
+    marginal_supply = make_marginal_supply_curve(supply_slice)
+
+    return pd.DataFrame({
+        "import_volume": volumes,
+        "supply_price": [get_marginal_supply_price(marginal_supply, v) for v in volumes],        # €/MWh
+        "demand_price": [interpolate_price_from_demand_curve(demand_slice, v) for v in volumes], # €/MWh
+    }, columns=["import_volume", "supply_price", "demand_price"])
+
+
+def cumulate_budget_gap(prices, step=1.0):
+    """
+    Cumulates the budget gap from the marginal supply and demand prices.
+    """
+
+    results = []
+    cum_gap = 0.0  # € 
+
+    for v, p_sup, p_dem in zip(prices["import_volume"], prices["supply_price"], prices["demand_price"]):
+        d_gap = (p_sup - p_dem) * step * 1e6
+        cum_gap += d_gap
+
+        results.append({
+            "import_volume": v,
+            "budget_gap": cum_gap / 1e9  # billion €
+        })
+
+    return pd.DataFrame(results)
+
+
+def calculate_budget_gap(
+    supply_curve,
+    demand_curve,
+    region,
+    scenario,
+    year,
+    step=1.0
+):
+    """
+    Analyse the budget gap between supply and demand.
+    """
+
+    supply_slice, demand_slice = filter_budget_gap_slices(supply_curve, demand_curve, region, scenario, year)
+    volumes = make_import_volumes(supply_slice, demand_slice, step)
+    prices = calculate_marginal_prices(supply_slice, demand_slice, volumes)
+
+    return cumulate_budget_gap(prices, step)
+
+
+def first_changed_volume(supply_stored, supply_slice, demand_stored, demand_slice):
+    """
+    Returns the import volume below which the marginal prices are not affected by changed rows.
+
+    Supply prices only change from the left edge of the first changed marginal supply block,
+    demand prices only from the demand point preceding the first changed point. This point
+    itself is affected, since it may switch between the last (clamped) and an interpolated point.
+    """
+
+    volume = np.inf
+
+    # Supply: compare marginal supply intervals in merit order
+    old = make_marginal_supply_curve(supply_stored).reset_index(drop=True)
+    new = make_marginal_supply_curve(supply_slice).reset_index(drop=True)
+    changed = first_changed_row(old[["x_right", "price"]], new[["x_right", "price"]])
+    if changed is not None:
+        volume = min(volume, new["x_left"].iloc[changed] if changed < len(new) else old["x_left"].iloc[changed])
+
+    # Demand: compare demand points sorted by import volume
+    old = demand_stored.sort_values("import_demand").reset_index(drop=True)
+    new = demand_slice.sort_values("import_demand").reset_index(drop=True)
+    changed = first_changed_row(old[["import_demand", "price"]], new[["import_demand", "price"]])
+    if changed is not None:
+        volume = min(volume, new["import_demand"].iloc[changed - 1] if changed > 0 else 0.0)
+
+    return float(volume)
+
+
+def first_changed_row(old, new):
+    """
+    Returns the position of the first row that differs between two tables or None if they are equal.
+    """
+
+    n = min(len(old), len(new))
+    differs = (old.iloc[:n].to_numpy() != new.iloc[:n].to_numpy()).any(axis=1)
+    if differs.any():
+        return int(np.argmax(differs))
+    if len(old) != len(new):
+        return n
+    return None
+
+
+def update_budget_gap(
+    prices,
+    supply_stored,
+    demand_stored,
+    supply_curve,
+    demand_curve,
+    region,
+    scenario,
+    year,
+    step=1.0
+):
+    """
+    Recompute the budget gap only from the first changed import volume onward.
+
+    Parameters:
+    - prices: stored marginal prices (see calculate_marginal_prices)
+    - supply_stored, demand_stored: supply and demand slices the stored prices are based on
+    - supply_curve, demand_curve, region, scenario, year, step: see calculate_budget_gap
+
+    Returns:
+    - tuple of budget gap, marginal prices, supply slice and demand slice;
+      the budget gap is identical to calculate_budget_gap
+    """
+
+    supply_slice, demand_slice = filter_budget_gap_slices(supply_curve, demand_curve, region, scenario, year)
+    volumes = make_import_volumes(supply_slice, demand_slice, step)
+
+    # Keep stored prices of all volumes strictly below the first change
+    volume = first_changed_volume(supply_stored, supply_slice, demand_stored, demand_slice)
+    n_keep = min(int(np.searchsorted(volumes, volume, side="left")), len(prices))
+    if not np.array_equal(prices["import_volume"].iloc[:n_keep].to_numpy(), volumes[:n_keep]):
+        n_keep = 0
+
+    prices = pd.concat([
+        prices.iloc[:n_keep],
+        calculate_marginal_prices(supply_slice, demand_slice, volumes[n_keep:]),
+    ], ignore_index=True)
+
+    return cumulate_budget_gap(prices, step), prices, supply_slice, demand_slice
+
+
+def calculate_budget_gaps(
+    supply_curves,
+    demand_curve,
+    region,
+    scenario,
+    year,
+    step=1.0
+):
+    """
+    Analyse the budget gap for several carriers and merge them into one wide table.
+
+    Parameters:
+    - supply_curves: dict of carrier → supply curve DataFrame
+    - demand_curve: DataFrame with demand data
+    - region, scenario, year, step: see calculate_budget_gap
+
+    Returns:
+    - DataFrame with import_volume and one budget_gap_<carrier> column per carrier
+    """
+
+    df_all = None
+
+    for carrier, supply_curve in supply_curves.items():
+        budget_gap = calculate_budget_gap(
+            supply_curve=supply_curve,
+            demand_curve=demand_curve,
+            region=region,
+            scenario=scenario,
+            year=year,
+            step=step
+        )
+
+        # rename budget_gap column to carrier-specific
+        budget_gap = budget_gap.rename(columns={"budget_gap": f"budget_gap_{carrier}"})
+
+        # merge into wide table
+        if df_all is None:
+            df_all = budget_gap
+        else:
+            df_all = df_all.merge(budget_gap, on="import_volume", how="outer")
+
+    return df_all
+
+
+def update_budget_gaps(
+    state_path,
+    supply_curves,
+    demand_curve,
+    region,
+    scenario,
+    year,
+    final_carrier,
+    wacc,
+    step=1.0
+):
+    """
+    Incremental version of calculate_budget_gaps.
+
+    For each carrier the marginal prices and the supply and demand slices they are
+    based on are stored in state_path. Only import volumes affected by changed
+    supply or demand rows are recomputed, the result is identical to calculate_budget_gaps.
+    The state is stored per region, scenario, carrier, final carrier, wacc, year and step.
+    """
+
+    df_all = None
+
+    for carrier, supply_curve in supply_curves.items():
+        name = os.path.join(state_path, f"{region}_budget_gap_{scenario}_{carrier}_{final_carrier}_{wacc}_{year}_{step}")
+        paths = {table: f"{name}_{table}.csv" for table in ["prices", "supply", "demand"]}
+
+        if all(os.path.exists(path) for path in paths.values()):
+            prices, supply_stored, demand_stored = (
+                pd.read_csv(paths[table], index_col=0, float_precision="round_trip")
+                for table in ["prices", "supply", "demand"]
+            )
+            budget_gap, prices, supply_slice, demand_slice = update_budget_gap(
+                prices=prices,
+                supply_stored=supply_stored,
+                demand_stored=demand_stored,
+                supply_curve=supply_curve,
+                demand_curve=demand_curve,
+                region=region,
+                scenario=scenario,
+                year=year,
+                step=step
+            )
+        else:
+            supply_slice, demand_slice = filter_budget_gap_slices(supply_curve, demand_curve, region, scenario, year)
+            volumes = make_import_volumes(supply_slice, demand_slice, step)
+            prices = calculate_marginal_prices(supply_slice, demand_slice, volumes)
+            budget_gap = cumulate_budget_gap(prices, step)
+
+        # Store state for the next update
+        os.makedirs(state_path, exist_ok=True)
+        prices.to_csv(paths["prices"])
+        supply_slice.to_csv(paths["supply"])
+        demand_slice.to_csv(paths["demand"])
+
+        # rename budget_gap column to carrier-specific
+        budget_gap = budget_gap.rename(columns={"budget_gap": f"budget_gap_{carrier}"})
+
+        # merge into wide table
+        if df_all is None:
+            df_all = budget_gap
+        else:
+            df_all = df_all.merge(budget_gap, on="import_volume", how="outer")
+
+    return df_all
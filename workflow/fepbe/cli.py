@@ -0,0 +1,248 @@
+# Command-line interface
+#
+# Usage: fepbe <command> [options], see fepbe --help
+# pypsa and matplotlib are only imported by the commands that need them.
+
+# Import packages
+import argparse
+import os
+
+
+def supply_curve_filename(args, transport_carrier, table="supply_curve", inc=False):
+    return f"{table}_{transport_carrier}_{args.final_carrier}_{args.wacc}_{args.resolution}{'_inc' if inc else ''}_{args.prefix}.csv"
+
+
+def demand_curve_filename(args, carrier):
+    return f"demand_curve-{args.prefix}-{carrier}.csv"
+
+
+def supply_curve(args):
+    """
+    Extract supply curve (and cost breakdown) from PyPSA-Earth postnetworks.
+    """
+    from fepbe.supply_curve import calculate_import_blocks, default_config, extract_supply_curve, update_supply_curve
+
+    path_supply_curve = os.path.join(args.output_path, supply_curve_filename(args, args.transport_carrier))
+    path_cost_curve = os.path.join(args.output_path, supply_curve_filename(args, args.transport_carrier, table="cost_breakdown"))
+
+    # Stored cost breakdown would keep the old rows of the re-extracted countries
+    if args.update and not args.cost_breakdown and os.path.exists(path_cost_curve):
+        raise SystemExit(f"--update requires --cost-breakdown to keep {path_cost_curve} consistent")
+    if args.update and args.cost_breakdown and os.path.exists(path_supply_curve) and not os.path.exists(path_cost_curve):
+        raise SystemExit(f"{path_cost_curve} does not exist, run without --update to extract all countries")
+
+    supply_curve, cost_curve = extract_supply_curve(
+        base_path=args.base_path,
+        config=default_config(args.countries),
+        transport_carrier=[args.transport_carrier],
+        cluster=args.cluster,
+        resolution=args.resolution,
+        wacc=args.wacc,
+        cost_breakdown=args.cost_breakdown,
+    )
+
+    # Only replace the re-extracted countries in the stored results
+    if args.update:
+        import pandas as pd
+
+        if os.path.exists(path_supply_curve):
+            supply_curve = update_supply_curve(pd.read_csv(path_supply_curve, index_col=0), supply_curve)
+        if cost_curve is not None and os.path.exists(path_cost_curve):
+            cost_curve = update_supply_curve(pd.read_csv(path_cost_curve, index_col=0), cost_curve)
+
+    supply_curve.to_csv(path_supply_curve)
+    if cost_curve is not None:
+        cost_curve.to_csv(path_cost_curve)
+
+    supply_curve = calculate_import_blocks(supply_curve)
+    supply_curve.to_csv(os.path.join(args.output_path, supply_curve_filename(args, args.transport_carrier, inc=True)))
+
+
+def demand_curve(args):
+    """
+    Extract demand curve from PyPSA-Eur networks.
+    """
+    from fepbe.demand_curve import default_prices, default_scenarios, extract_demand_curve
+
+    demand_curve = extract_demand_curve(
+        base_path=args.base_path,
+        scenarios=default_scenarios(args.carrier),
+        years=args.years,
+        prices=default_prices,
+        regions=args.regions,
+        carrier=args.carrier,
+        cluster=args.cluster,
+    )
+
+    demand_curve.to_csv(os.path.join(args.output_path, demand_curve_filename(args, args.carrier)))
+
+
+def budget_gap_filename(args, year):
+    return f"{args.region}_budget_gap_{args.scenario}_{'-'.join(args.carriers)}_{args.final_carrier}_{args.wacc}_{year}.csv"
+
+
+def budget_gap(args):
+    """
+    Calculate budget gap between supply and demand curves.
+    """
+    import pandas as pd
+
+    from fepbe.budget_gap import calculate_budget_gaps, update_budget_gaps
+
+    supply_curves = {
+        carrier: pd.read_csv(os.path.join(args.curves_path, supply_curve_filename(args, carrier, inc=True)), index_col=0)
+        for carrier in args.carriers
+    }
+    demand_curve = pd.read_csv(os.path.join(args.curves_path, demand_curve_filename(args, args.final_carrier)), index_col=0)
+
+    for year in args.years:
+        if args.state_path is None:
+            df_all = calculate_budget_gaps(
+                supply_curves=supply_curves,
+                demand_curve=demand_curve,
+                region=args.region,
+                scenario=args.scenario,
+                year=year,
+                step=args.step,
+            )
+        else:
+            df_all = update_budget_gaps(
+                state_path=args.state_path,
+                supply_curves=supply_curves,
+                demand_curve=demand_curve,
+                region=args.region,
+                scenario=args.scenario,
+                year=year,
+                final_carrier=args.final_carrier,
+                wacc=args.wacc,
+                step=args.step,
+            )
+        df_all.to_csv(os.path.join(args.output_path, budget_gap_filename(args, year)), index=False)
+
+
+def plot_budget_gap(args):
+    """
+    Plot budget gap of all carriers.
+    """
+    import pandas as pd
+
+    from fepbe.plotting import plot_budget_gap
+
+    budget_gaps = {
+        year: pd.read_csv(os.path.join(args.results_path, budget_gap_filename(args, year)))
+        for year in args.years
+    }
+
+    plot_budget_gap(
+        budget_gaps=budget_gaps,
+        years=args.years,
+        output_path=args.output_path,
+        filename=f"{args.region}_budget_gap.png",
+    )
+
+
+def plot_supply_demand_curve(args):
+    """
+    Plot supply and demand curves for all years.
+    """
+    import pandas as pd
+
+    from fepbe.plotting import color_map, plot_combined_supply_demand_all_years
+
+    path_supply_curve = os.path.join(args.curves_path, supply_curve_filename(args, args.transport_carrier, inc=True))
+    path_demand_curve = os.path.join(args.curves_path, demand_curve_filename(args, args.demand_carrier))
+
+    supply_curve = pd.read_csv(path_supply_curve, index_col=0)
+    demand_curve = pd.read_csv(path_demand_curve, index_col=0)
+
+    for region in args.regions:
+        plot_combined_supply_demand_all_years(
+            supply_curve=supply_curve,
+            demand_curve=demand_curve[demand_curve["scenario"].isin(args.scenarios)],
+            region=region,
+            years=args.years,
+            output_path=args.output_path,
+            final_carrier=args.final_carrier,
+            filename=f"{region}_s-d-curve_comb_all_years_{args.transport_carrier}_{args.final_carrier}_{args.wacc}.png",
+            color_map=color_map,
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="fepbe", description="Evaluation of FEPBE supply curves, demand curves and budget gaps.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Supply curve (PyPSA-Earth)
+    p = subparsers.add_parser("supply-curve", help="extract supply curve from PyPSA-Earth postnetworks")
+    p.add_argument("--base-path", required=True, help="results path of PyPSA-Earth")
+    p.add_argument("--output-path", default=".")
+    p.add_argument("--transport-carrier", default="LH2", help="LH2, NH3, MEOH")
+    p.add_argument("--final-carrier", default="H2", help="H2, NH3, MEOH")
+    p.add_argument("--countries", nargs="+", default=None)
+    p.add_argument("--cluster", type=int, default=16)
+    p.add_argument("--resolution", default="3H")
+    p.add_argument("--wacc", default="0.09")
+    p.add_argument("--cost-breakdown", action="store_true", help="extract capex/opex per technology group")
+    p.add_argument("--update", action="store_true", help="only replace the extracted countries in the stored supply curve")
+    p.add_argument("--prefix", default="fepbe")
+    p.set_defaults(func=supply_curve)
+
+    # Demand curve (PyPSA-Eur)
+    p = subparsers.add_parser("demand-curve", help="extract demand curve from PyPSA-Eur networks")
+    p.add_argument("--base-path", required=True, help="results path of PyPSA-Eur")
+    p.add_argument("--output-path", default=".")
+    p.add_argument("--carrier", default="H2", help="H2, NH3, Methanol")
+    p.add_argument("--years", nargs="+", type=int, default=[2030, 2050])
+    p.add_argument("--regions", nargs="+", default=["EU"])
+    p.add_argument("--cluster", type=int, default=39)
+    p.add_argument("--prefix", default="fepbe")
+    p.set_defaults(func=demand_curve)
+
+    # Budget gap
+    for name, func, help in [
+        ("budget-gap", budget_gap, "calculate budget gap between supply and demand curves"),
+        ("plot-budget-gap", plot_budget_gap, "plot budget gap of all carriers"),
+    ]:
+        p = subparsers.add_parser(name, help=help)
+        p.add_argument("--carriers", nargs="+", default=["LH2"], help="LH2, NH3, MEOH")
+        p.add_argument("--final-carrier", default="H2", help="H2, NH3, MEOH")
+        p.add_argument("--wacc", default="0.09")
+        p.add_argument("--years", nargs="+", type=int, default=[2050])
+        p.add_argument("--scenario", default="config.GreenDeal")
+        p.add_argument("--region", default="EU")
+        p.add_argument("--output-path", default=".")
+        p.set_defaults(func=func)
+        if func is budget_gap:
+            p.add_argument("--curves-path", default=".", help="path of supply and demand curves")
+            p.add_argument("--step", type=float, default=1.0, help="volume step in TWh")
+            p.add_argument("--state-path", default=None, help="path of stored marginal prices, only changed volumes are recomputed")
+            p.add_argument("--resolution", default="3H")
+            p.add_argument("--prefix", default="fepbe")
+        else:
+            p.add_argument("--results-path", default=".", help="path of budget gap results")
+
+    # Supply demand curve plot
+    p = subparsers.add_parser("plot-s-d-curve", help="plot supply and demand curves")
+    p.add_argument("--curves-path", default=".", help="path of supply and demand curves")
+    p.add_argument("--output-path", default=".")
+    p.add_argument("--transport-carrier", default="LH2", help="LH2, NH3, MEOH")
+    p.add_argument("--final-carrier", default="H2", help="H2, NH3, MEOH")
+    p.add_argument("--demand-carrier", default="H2", help="H2, NH3, Methanol")
+    p.add_argument("--wacc", default="0.09")
+    p.add_argument("--resolution", default="3H")
+    p.add_argument("--years", nargs="+", type=int, default=[2030, 2050])
+    p.add_argument("--regions", nargs="+", default=["EU"])
+    p.add_argument("--scenarios", nargs="+", default=["config.GreenDeal", "config.BAU"])
+    p.add_argument("--prefix", default="fepbe")
+    p.set_defaults(func=plot_supply_demand_curve)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
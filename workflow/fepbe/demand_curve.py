@@ -0,0 +1,128 @@
+# Analyse demand curves (PyPSA-Eur)
+
+# Import packages
+import os
+
+import numpy as np
+import pandas as pd
+
+
+# Default demand curve settings
+default_prices = np.arange(0, 201, 10)
+default_years = [2030, 2050]
+
+
+def default_scenarios(carrier):
+    """
+    Returns the default scenario wildcards for an import carrier.
+    """
+    return {
+        "config.GreenDeal": f"3H-imp+{carrier}",
+        "config.BAU": f"3H-imp+{carrier}"
+        }
+
+
+# Function: Extract import demand and price from PyPSA network
+def import_demand(pypsa_path, regions, price, year, scenario, carrier):
+    """
+    Extract import demand and price for selected regions from a PyPSA-Eur network.
+
+    Parameters:
+    - pypsa_path: path to the .nc network file
+    - regions: list of region names (e.g., ["DE", "EU"])
+    - price: price applied in the run
+    - year: target year
+    - scenario: scenario key (e.g., "config.main")
+    - carrier: export carrier
+
+    Returns:
+    - DataFrame with import carrier demand per region
+    """
+    import pypsa
+
+    import_demand_carrier = pd.DataFrame()
+    if os.path.exists(pypsa_path):
+        n = pypsa.Network(pypsa_path)
+    else:
+        print(f"File not found: Import demand for {scenario}-{year}-{carrier}-{price} is set to 0")
+    
+    for region in regions:
+        if not os.path.exists(pypsa_path):
+            df_import_carrier = 0 
+        elif region == "EU":
+            df_import_carrier = n.statistics.energy_balance()
+            idx = pd.IndexSlice
+            try:
+                if carrier == "H2":
+                    df_import_carrier = df_import_carrier.loc[idx[:,:,"Hydrogen Storage"]].div(1e6).Generator["import H2"]
+                elif carrier == "NH3":
+                    df_import_carrier = df_import_carrier.loc[idx[:,:,"NH3"]].div(1e6).Generator["import NH3"]
+                elif carrier == "Methanol":
+                    df_import_carrier = df_import_carrier.loc[idx[:,:,"methanol"]].div(1e6).Link["import methanol"]
+            except:
+                df_import_carrier = 0  
+        else:
+            df_import_carrier = n.statistics.energy_balance(groupby=["carrier", "bus_carrier", "country"])
+            idx = pd.IndexSlice
+            try:
+                if carrier == "H2":
+                    df_import_carrier = df_import_carrier.loc[idx[:,:,"Hydrogen Storage",region]].div(1e6).Generator["import H2"]
+                elif carrier == "NH3":
+                    df_import_carrier = df_import_carrier.loc[idx[:,:,"NH3",region]].div(1e6).Generator["import NH3"]
+                elif carrier == "Methanol":
+                    df_import_carrier = df_import_carrier.loc[idx[:,:,"methanol",region]].div(1e6).Link["import methanol"]
+            except:
+                df_import_carrier = 0
+
+        # Store extracted values in consistent format  
+        df_import_carrier = pd.DataFrame({"region": region, "year": [year], "scenario": [scenario], "price": [price], "import_demand": [df_import_carrier]})
+        import_demand_carrier = pd.concat([import_demand_carrier, df_import_carrier], ignore_index=True)
+
+    return import_demand_carrier
+
+
+# Function: Build demand curve from all PyPSA-Eur networks
+def extract_demand_curve(
+    base_path,
+    scenarios,
+    years,
+    prices,
+    regions,
+    carrier,
+    cluster=39
+):
+    """
+    Build the demand curve of all PyPSA-Eur networks.
+
+    Parameters:
+    - base_path: results path of PyPSA-Eur
+    - scenarios: dict of scenario key → scenario wildcard
+    - years: list of target years
+    - prices: list of import prices applied in the runs
+    - regions: list of region names (e.g., ["DE", "EU"])
+    - carrier: import carrier (H2, NH3, Methanol)
+    - cluster: number of clusters
+
+    Returns:
+    - DataFrame with demand curve data
+    """
+    demand_curve = pd.DataFrame()
+
+    for scenario in scenarios:
+        for year in years:
+            for price in prices:
+                path = os.path.join(base_path, scenario, f"base_s_{cluster}__{scenarios[scenario]}+{price}_{year}.nc")
+
+                # Get import demand in relation to import price
+                import_demand_carrier = import_demand(
+                    pypsa_path=path, 
+                    regions=regions, 
+                    price=price, 
+                    year=year, 
+                    scenario=scenario,
+                    carrier=carrier)
+                
+                # Store demand caurve data
+                demand_curve = pd.concat([demand_curve, import_demand_carrier], ignore_index=True)
+
+    return demand_curve
@@ -0,0 +1,206 @@
+# Plot supply demand curves and budget gaps
+
+# Import packages
+import os
+
+
+# Plot settings
+plots_region_labels = {"DE": "Germany", "EU": "Europe"}
+
+plots_scenario_labels = {
+    "config.GreenDeal": "Import - Green Deal",
+    "config.BAU": "Import - Business As Usual"
+    }
+
+color_map = {"config.GreenDeal": "#2ca02c", "config.BAU": "#d62728"}
+
+budget_gap_colors = {"NH3": "#2ca02c", "MEOH": "#d62728", "LH2": "orange"}
+
+budget_gap_labels = {"NH3": "NH$_3$", "MEOH": "MeOH", "LH2": "LH$_2$"}
+
+budget_gap_xlim = {2030: 110, 2050: 650}
+
+carrier_labels = {"H2": "Hydrogen", "NH3": "Ammonia", "MEOH": "Methanol"}
+
+supply_demand_xlim = {2030: 115, 2050: 578}
+
+
+def plot_budget_gap(budget_gaps, years, output_path, filename="EU_budget_gap.png"):
+    """
+    Plot and save the budget gap of all carriers for each year.
+
+    Parameters:
+    - budget_gaps: dict of year → DataFrame with import_volume and budget_gap_<carrier> columns
+    - years: list of int, e.g., [2030, 2050]
+    - output_path: str, path to folder where the output figure is saved
+    - filename: str, name of the output figure
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as mticker
+
+    fig, axes = plt.subplots(1, len(years), figsize=(4.5 * len(years), 4), sharey=True)
+    
+    if len(years) == 1:
+        axes = [axes]
+
+    for ax, year in zip(axes, years):
+        df = budget_gaps[year]
+
+        if not df.empty:
+            for column in df.columns.drop("import_volume"):
+                carrier = column.removeprefix("budget_gap_")
+                ax.plot(
+                    df["import_volume"], df[column],
+                    linestyle="-", linewidth=2,
+                    color=budget_gap_colors.get(carrier),
+                    label=budget_gap_labels.get(carrier, carrier)
+                )
+
+        ax.axhline(0, color="gray", linestyle="--", linewidth=0.8)
+        ax.set_title(f"{year}")
+        ax.set_xlabel("H$_2$ Volume [TWh]")
+        ax.grid(True, linestyle="--", alpha=0.5)
+
+        # Adjust scope of x axis
+        ax.set_xlim(left=0, right=budget_gap_xlim.get(year))
+        ax.set_ylim(bottom=-10, top=30)
+        ax.yaxis.set_major_locator(mticker.MultipleLocator(10))
+
+    axes[0].set_ylabel("Budget Gap [Billion €]")
+
+    handles, labels = axes[-1].get_legend_handles_labels()
+    fig.legend(handles, labels,
+               loc='lower center', bbox_to_anchor=(0.5, -0.1),
+               ncol=3, frameon=False)
+
+    fig.tight_layout(rect=[0, 0.12, 1, 0.95])
+
+    plt.savefig(os.path.join(output_path, filename), dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+# Function: Plot all demand curves (scenarios) for one region for all years
+def plot_combined_supply_demand_all_years(
+    supply_curve,
+    demand_curve,
+    region,
+    years,
+    output_path,
+    final_carrier,
+    filename,
+    color_map=None
+):
+    """
+    Plot and save a combined figure showing supply and demand curves across multiple years for one region.
+
+    Parameters:
+    - supply_curve: DataFrame with supply data (columns: region, year, import_demand, price)
+    - demand_curve: DataFrame with demand data (columns: region, year, scenario, import_demand, price)
+    - region: str, name of the importing region ("DE" or "EU")
+    - years: list of int, e.g., [2030, 2040, 2050]
+    - output_path: str, path to folder where the output figure is saved
+    - final_carrier: str, final carrier of the supply curve (H2, NH3, MEOH)
+    - filename: str, name of the output figure
+    """
+    import matplotlib.colors as mcolors
+    import matplotlib.pyplot as plt
+
+    # Assign default matplotlib colors to each export region
+    region_names = supply_curve["region"].unique().tolist()
+    default_colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+    export_colors = dict(zip(region_names, default_colors[:len(region_names)]))
+
+    # Create a row of subplots: one column per year
+    fig, axes = plt.subplots(1, len(years), figsize=(4.5 * len(years), 5), sharey=True)
+
+    # Ensure axes is iterable even if only one subplot
+    if len(years) == 1:
+        axes = [axes]
+
+    legend_handles = []
+    legend_labels = []
+
+    # Use a color palette from matplotlib (tab10 or Set2 for better color contrast)
+    if color_map == None:
+        scenario_list = sorted(demand_curve["scenario"].unique())
+        color_palette = list(mcolors.TABLEAU_COLORS.values())
+        if len(scenario_list) > len(color_palette):
+            color_palette = plt.cm.tab20.colors
+        
+        color_map = dict(zip(scenario_list, color_palette[:len(scenario_list)]))
+
+    for ax, year in zip(axes, years):
+        # --- SUPPLY CURVE ---
+        supply = supply_curve[supply_curve["year"] == year].sort_values("price").copy()
+        supply["cumulative_export"] = supply["import_demand"].cumsum()
+        supply["x_left"] = supply["cumulative_export"].shift(fill_value=0)
+        supply["x_right"] = supply["cumulative_export"]
+
+        plotted_regions = set()
+
+        for _, row in supply.iterrows():
+            label = f"{row['region']} (Export)" if row["region"] not in plotted_regions else None
+            handle = ax.fill_between([row["x_left"], row["x_right"]],
+                                     [row["price"], row["price"]],
+                                     y2=0,
+                                     step="pre",
+                                     label=label,
+                                     alpha=0.4,
+                                     color=export_colors.get(row["region"], "gray"),
+                                     edgecolor="none")
+            if label:
+                legend_handles.append(handle)
+                legend_labels.append(label)
+            plotted_regions.add(row["region"])
+
+        # --- DEMAND CURVES ---
+        demand_subset = demand_curve[(demand_curve["year"] == year) & (demand_curve["region"] == region)]
+
+        for scenario, df in demand_subset.groupby("scenario"):
+            df = df.sort_values("import_demand")
+            if df["import_demand"].sum() > 0:
+                line, = ax.plot(df["import_demand"], df["price"],
+                                linestyle="-", linewidth=2, marker="",
+                                label=f"{plots_region_labels[region]} ({scenario})",
+                                color=color_map[scenario])
+                legend_handles.append(line)
+                legend_labels.append(f"{plots_region_labels[region]} ({plots_scenario_labels[scenario]})")
+
+        # Labels and layout per subplot
+        ax.set_title(f"{year}")
+
+        if final_carrier in carrier_labels:
+            ax.set_xlabel(f"{carrier_labels[final_carrier]} volume [TWh]")
+            axes[0].set_ylabel(f"{carrier_labels[final_carrier]} cost at Europe gate [€/MWh]")
+            ax.set_xlim(left=0, right=supply_demand_xlim.get(year))
+
+        ax.grid(True, linestyle="--", alpha=0.5)
+
+    # --- Shared legend below all subplots ---
+    # Remove duplicates while preserving order
+    seen = set()
+    unique_handles_labels = []
+    for h, l in zip(legend_handles, legend_labels):
+        if l not in seen:
+            unique_handles_labels.append((h, l))
+            seen.add(l)
+
+    unique_handles_labels = sorted(
+        unique_handles_labels,
+        key=lambda x: "Europe" in x[1]  # False first, True last
+    )
+
+    handles, labels = zip(*unique_handles_labels)
+    fig.legend(handles, labels,
+               loc='lower center',
+               bbox_to_anchor=(0.5, -0.1),
+               ncol=4,
+               frameon=False)
+
+    # Title and layout
+    fig.suptitle(f"Supply & Demand Curves African Countries-{plots_region_labels[region]}", fontsize=14)
+    fig.tight_layout(rect=[0, 0.12, 1, 0.95])  # leave room for title and legend
+
+    # Save output file
+    plt.savefig(os.path.join(output_path, filename), dpi=300, bbox_inches='tight')
+    plt.close()
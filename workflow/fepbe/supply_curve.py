@@ -0,0 +1,288 @@
+# Analyse supply curves (PyPSA-Earth)
+
+# Import packages
+import os
+import re
+
+import pandas as pd
+
+
+# Default export scenarios for each country
+default_export = {
+    2030: {"scenario": "Co2L1.01-3H", "export": [5, 10, 15]}, #[5, 10, 15]
+    2050: {"scenario": "Co2L0.10-3H", "export": [25, 50, 75]}, #[25, 50, 75]
+}
+
+countries = ["Egypt", "Kenya", "Morocco", "Mauritania", "Namibia", "Tunisia", "South-Africa"]
+
+# Technology groups of the export chain
+# Carriers have to match one of the patterns completely (case-insensitive),
+# all other carriers (e.g. solar thermal, domestic shipping) are not part of the export chain
+technology_groups = {
+    "shipping": [r".* export", r"export .*"],
+    "electrolysis": [r"H2 Electrolysis", r"(alkaline|PEM) electrolyzer.*", r"SOEC"],
+    "synthesis": [r"Haber-Bosch", r"methanolisation", r"DAC", r"Fischer-Tropsch"],
+    "conversion": [r"H2 liquefaction", r"H2 evaporation", r"ammonia cracker"],
+    "storage": [r"battery( charger| discharger)?", r"H2 Store", r"H2 UHS", r"ammonia store", r"methanol store"],
+    "renewables": [r"onwind", r"offwind(-.*)?", r"solar", r"solar rooftop", r"solar-hsat", r"ror", r"hydro", r"csp"],
+}
+
+# Groups on the hydrogen side, which are shared with the domestic hydrogen demand
+hydrogen_groups = ["electrolysis"]
+
+# Groups on the electricity side, which are shared with the domestic electricity demand
+electricity_groups = ["renewables"]
+
+# Groups which are only used by the export chain
+export_groups = ["shipping", "synthesis", "conversion"]
+
+
+def default_config(regions=None):
+    """
+    Returns the default config with the export scenarios for each country.
+    """
+    regions = countries if regions is None else regions
+    return {co: {yr: dict(params) for yr, params in default_export.items()} for co in regions}
+
+
+# Function: Assign carrier to technology group
+def get_technology_group(carrier):
+    """
+    Returns the technology group of a carrier or None if it is not part of the export chain.
+    """
+    for group, patterns in technology_groups.items():
+        if any(re.fullmatch(pattern, carrier, flags=re.IGNORECASE) for pattern in patterns):
+            return group
+    return None
+
+
+# Function: Extract capex/opex per technology group from PyPSA network
+def export_cost_breakdown(n):
+    """
+    Extract capex and opex per technology group of the export chain from a PyPSA-Earth network.
+
+    Costs are allocated to the export with the following rules:
+    - shipping, synthesis and conversion are assumed to be only used by the export chain (share 1.0)
+    - electrolysis (and hydrogen, ammonia and methanol stores) with the hydrogen export share,
+      i.e. the share of the hydrogen withdrawal of shipping, synthesis and conversion
+    - renewables (and batteries) with the electricity export share, i.e. the share of the
+      electricity withdrawal of shipping, synthesis, conversion and the export share of electrolysis
+    Storage is excluded from both withdrawals. Domestic technologies (e.g. fuel cells) are not included.
+
+    Parameters:
+    - n: solved PyPSA network
+
+    Returns:
+    - dict with capex and opex in € for each technology group
+    """
+    capex = n.statistics.capex().groupby(level="carrier").sum()
+    opex = n.statistics.opex(aggregate_time="sum").groupby(level="carrier").sum()
+
+    def withdrawal_by_group(bus_carrier):
+        withdrawal = n.statistics.withdrawal(bus_carrier=bus_carrier, aggregate_time="sum").groupby(level="carrier").sum()
+        groups = [get_technology_group(c) for c in withdrawal.index]
+        withdrawal = withdrawal.groupby(groups, dropna=False).sum()
+        return withdrawal.drop("storage", errors="ignore")
+
+    def export_share(withdrawal, weights):
+        total = withdrawal.sum()
+        exported = sum(withdrawal.get(group, 0.0) * weight for group, weight in weights.items())
+        return exported / total if total > 0 else 0.0
+
+    # Export share of the hydrogen withdrawal
+    hydrogen_share = export_share(withdrawal_by_group("H2"), {group: 1.0 for group in export_groups})
+
+    # Export share of the electricity withdrawal
+    electricity_share = export_share(
+        withdrawal_by_group("AC"),
+        {**{group: 1.0 for group in export_groups}, **{group: hydrogen_share for group in hydrogen_groups}},
+    )
+
+    def get_share(carrier):
+        group = get_technology_group(carrier)
+        if group == "storage":
+            return electricity_share if carrier.lower().startswith("battery") else hydrogen_share
+        if group in hydrogen_groups:
+            return hydrogen_share
+        if group in electricity_groups:
+            return electricity_share
+        return 1.0
+
+    breakdown = {}
+    for group in technology_groups:
+        carriers_capex = [c for c in capex.index if get_technology_group(c) == group]
+        carriers_opex = [c for c in opex.index if get_technology_group(c) == group]
+        breakdown[f"capex_{group}"] = sum(capex[c] * get_share(c) for c in carriers_capex)
+        breakdown[f"opex_{group}"] = sum(opex[c] * get_share(c) for c in carriers_opex)
+
+    return breakdown
+
+
+# Function: Extract export price from PyPSA network
+def export_price(n):
+    """
+    Extract the export price including ship fuel costs from a PyPSA-Earth network.
+
+    Parameters:
+    - n: solved PyPSA network
+
+    Returns:
+    - tuple of price in €/MWh and exported energy in MWh
+    """
+    # LCOH2 for export
+    # Source: https://github.com/energyLS/aldehyde/blob/main/workflow/scripts/compare_integrated.py#L153
+    w = n.snapshot_weightings.objective  # Series indexed by snapshots
+
+    # Investments for fuel costs in €
+    price_fuel = n.buses_t.marginal_price.filter(like="fuel ship export")
+    flow_fuel = -n.links_t.p1.filter(like="fuel ship export")
+    fuel_costs_ship_invest = (price_fuel.mul(flow_fuel, axis=0).mul(w, axis=0)).sum().sum()
+
+    # Investments for export w/o fuel costs in €
+    price_export = n.buses_t.marginal_price.filter(like="destination carrier export")
+    flow_export = n.loads_t.p.filter(like="destination carrier export").sum(axis=1)
+    ship_export_invest = (price_export.mul(flow_export, axis=0).mul(w, axis=0)).sum().sum()
+
+    # Investments for export with fuel costs in €/MWh
+    volume = (flow_export.mul(w, axis=0)).sum().sum()
+    price = (fuel_costs_ship_invest + ship_export_invest) / volume
+
+    return price, volume
+
+
+# Function: Build supply curve from all PyPSA-Earth postnetworks
+def extract_supply_curve(
+    base_path,
+    config,
+    transport_carrier,
+    cluster=16,
+    resolution="3H",
+    wacc="0.09",
+    cost_breakdown=False
+):
+    """
+    Extract the supply curve (and optionally the cost breakdown) of all postnetworks.
+
+    Parameters:
+    - base_path: results path of PyPSA-Earth
+    - config: dict of country → year → {"scenario", "export"}
+    - transport_carrier: list of transport carriers (e.g., ["LH2"])
+    - cluster, resolution, wacc: scenario settings of the postnetworks
+    - cost_breakdown: extract capex/opex per technology group as well
+
+    Returns:
+    - tuple of supply curve DataFrame and cost breakdown DataFrame (None if not extracted)
+    """
+    import pypsa
+
+    supply_curve = []
+    cost_curve = []
+
+    for co, years_cfg in config.items():
+        for yr, params in years_cfg.items():
+            sc = params["scenario"]
+            export_list = params["export"]
+
+            for ca in transport_carrier:
+                for ex in export_list:
+                    filename = (
+                        f"elec_s_{cluster}_ec_lvopt_{sc}_{resolution}_{yr}"
+                        f"_{wacc}_NZ_exp{ca}v{ex}.nc"
+                    )
+
+                    results_path = os.path.join(
+                        base_path,
+                        co,
+                        "pypsa-earth",
+                        "results",
+                        co,
+                        "postnetworks",
+                        filename,
+                    )
+
+                    try:
+                        n = pypsa.Network(results_path)
+                    except FileNotFoundError:
+                        print(f"Missing: {results_path}")
+                        continue
+
+                    price, volume = export_price(n)
+
+                    # Store the results in the same format
+                    supply_curve.append(
+                        {
+                            "region": co,
+                            "export": ca,
+                            "year": yr,
+                            "import_demand": ex,
+                            "price": price,
+                        }
+                    )
+
+                    # Cost breakdown of the export chain in the same row order as the supply curve
+                    if cost_breakdown:
+                        cost_curve.append(
+                            {
+                                "region": co,
+                                "export": ca,
+                                "year": yr,
+                                "import_demand": ex,
+                                "export_volume": volume,
+                                **export_cost_breakdown(n),
+                            }
+                        )
+
+    supply_curve = pd.DataFrame(supply_curve)
+    cost_curve = pd.DataFrame(cost_curve) if cost_breakdown else None
+
+    return supply_curve, cost_curve
+
+
+# Function: Convert cumulative export scenarios into supply blocks
+def calculate_import_blocks(supply_curve):
+    """
+    Consider overall export amount for supply curve.
+
+    The sum of all export amounts for each country should not exceed highest export scenario,
+    thus import_demand is replaced by the incremental energy quantity per country/year.
+    """
+    df = supply_curve.copy()
+
+    # Sort data
+    df = df.sort_values(["region", "year", "import_demand"])
+
+    # Calculate incremental energy quantity per country/year
+    # Relevant for supply-demand curve
+    group_cols = ["region", "year"]
+    df["import_block"] = df.groupby(group_cols)["import_demand"].diff()
+    df["import_block"] = df["import_block"].fillna(df["import_demand"])
+
+    # Keep format of supply curve
+    supply_curve = supply_curve.copy()
+    supply_curve["import_demand"] = df["import_block"]
+
+    return supply_curve
+
+
+# Function: Replace re-extracted rows in a stored supply curve
+def update_supply_curve(stored, supply_curve):
+    """
+    Replace the rows of supply_curve within the stored supply curve.
+
+    Rows are matched by region, export, year and import_demand. The row order of the
+    stored supply curve is kept and new rows are appended. Stored rows without a
+    re-extracted network (e.g. missing files) are kept. Works for the cost breakdown as well.
+    """
+    if supply_curve.empty:
+        return stored.copy()
+
+    keys = ["region", "export", "year", "import_demand"]
+    stored = stored.set_index(keys)
+    supply_curve = supply_curve.set_index(keys)
+
+    # Replace existing rows in place and append new rows
+    updated = stored.index.isin(supply_curve.index)
+    added = supply_curve.index[~supply_curve.index.isin(stored.index)]
+    merged = pd.concat([stored[~updated], supply_curve])
+
+    return merged.loc[stored.index.append(added)].reset_index()
@@ -10,14 +10,9 @@
 
 
 # Import packages
-import pypsa
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-import os
-import matplotlib.cm as cm
-import matplotlib.colors as mcolors
-import matplotlib.ticker as mticker
+
+from fepbe.demand_curve import extract_demand_curve
 
 
 # Demand curve settings (PyPSA-Eur)
@@ -45,82 +40,15 @@ path_analyse_results = f"workflow/results/s-d-curve/{prefix}-{carrier}"
 # General settings
 path_notebooks = "/home/alex-charly/SSD/H2GMA/Github/AP10/analyse-h2g-a-ap10/workflow/notebooks/supply-curve-analysis/fepbe/"
 
-# Function: Extract import demand and price from PyPSA network
-def import_demand(pypsa_path, regions, price, year, scenario, carrier):
-    """
-    Extract import demand and price for selected regions from a PyPSA-Eur network.
-
-    Parameters:
-    - pypsa_path: path to the .nc network file
-    - regions: list of region names (e.g., ["DE", "EU"])
-    - price: price applied in the run
-    - year: target year
-    - scenario: scenario key (e.g., "config.main")
-    - carrier: export carrier
-
-    Returns:
-    - DataFrame with import carrier demand per region
-    """
-    import_demand_carrier = pd.DataFrame()
-    if os.path.exists(pypsa_path):
-        n = pypsa.Network(pypsa_path)
-    else:
-        print(f"File not found: Import demand for {scenario}-{year}-{carrier}-{price} is set to 0")
-    
-    for region in regions:
-        if not os.path.exists(pypsa_path):
-            df_import_carrier = 0 
-        elif region == "EU":
-            df_import_carrier = n.statistics.energy_balance()
-            idx = pd.IndexSlice
-            try:
-                if carrier == "H2":
-                    df_import_carrier = df_import_carrier.loc[idx[:,:,"Hydrogen Storage"]].div(1e6).Generator["import H2"]
-                elif carrier == "NH3":
-                    df_import_carrier = df_import_carrier.loc[idx[:,:,"NH3"]].div(1e6).Generator["import NH3"]
-                elif carrier == "Methanol":
-                    df_import_carrier = df_import_carrier.loc[idx[:,:,"methanol"]].div(1e6).Link["import methanol"]
-            except:
-                df_import_carrier = 0  
-        else:
-            df_import_carrier = n.statistics.energy_balance(groupby=["carrier", "bus_carrier", "country"])
-            idx = pd.IndexSlice
-            try:
-                if carrier == "H2":
-                    df_import_carrier = df_import_carrier.loc[idx[:,:,"Hydrogen Storage",region]].div(1e6).Generator["import H2"]
-                elif carrier == "NH3":
-                    df_import_carrier = df_import_carrier.loc[idx[:,:,"NH3",region]].div(1e6).Generator["import NH3"]
-                elif carrier == "Methanol":
-                    df_import_carrier = df_import_carrier.loc[idx[:,:,"methanol",region]].div(1e6).Link["import methanol"]
-            except:
-                df_import_carrier = 0
-
-        # Store extracted values in consistent format  
-        df_import_carrier = pd.DataFrame({"region": region, "year": [year], "scenario": [scenario], "price": [price], "import_demand": [df_import_carrier]})
-        import_demand_carrier = pd.concat([import_demand_carrier, df_import_carrier], ignore_index=True)
-
-    return import_demand_carrier
-
-
 # Build demand curve dataFrame
-demand_curve = pd.DataFrame()
-
-for scenario in scenarios:
-    for year in years:
-        for price in prices:
-            path = f"/mnt/m/AP10-pypsa-eur/{scenario}/base_s_{cluster}__{scenarios[scenario]}+{price}_{year}.nc"
-
-            # Get import demand in relation to import price
-            import_demand_carrier = import_demand(
-                pypsa_path=path, 
-                regions=regions, 
-                price=price, 
-                year=year, 
-                scenario=scenario,
-                carrier=carrier)
-            
-            # Store demand caurve data
-            demand_curve = pd.concat([demand_curve, import_demand_carrier], ignore_index=True)
+demand_curve = extract_demand_curve(
+    base_path="/mnt/m/AP10-pypsa-eur",
+    scenarios=scenarios,
+    years=years,
+    prices=prices,
+    regions=regions,
+    carrier=carrier,
+    cluster=cluster)
 
 # Create csv file with demand curve data
-demand_curve.to_csv(f"{path_notebooks}/demand_curve-{prefix}-{carrier}.csv")
\ No newline at end of file
+demand_curve.to_csv(f"{path_notebooks}/demand_curve-{prefix}-{carrier}.csv")